@@ -28,39 +28,61 @@
 from smbus import SMBus
 from RPi import GPIO
 
-from DSP_TDA7313 import DSP_TDA7313 as DSP
-from TUNER_BIG import TUNER_BIG as TUNER
+from BoardChip import loadChip
 
-from time import sleep
+from time import sleep, time
+import threading
+import weakref
 import math
 
 
 class Board:
 	# Methods list
-	# * __init__(gpio_en, gpio_stby, i2cbus = None, gpio_mode_bcm = False)
+	# * __init__(gpio_en, gpio_stby, i2cbus = None, gpio_mode_bcm = False, chips = None)
 	# * power(on = None)
 	# * reset()
 	# * mute(on = None)
+	# * idle(mute = None, standby = None, off = None)
 	
 	# Constants list
-	# * DSP - holding instance of DSP control class
-	# * TUNER - holding instance of TUNER control class
+	# * CHIPS - default chips fitted on the board - {slot: type}
+	# * DSP - holding instance of DSP control class (for default chips)
+	# * TUNER - holding instance of TUNER control class (for default chips)
+	# * IDLE_ACTIVE - idle stage - board is running as set up
+	# * IDLE_MUTE - idle stage - chips are muted (e.g. DSP speaker attenuators)
+	# * IDLE_STANDBY - idle stage - amplifier is in stand-by mode
+	# * IDLE_OFF - idle stage - on-board voltage regulators are off
 	
 	# Internal variables list
 	# * _gpio_en - GPIO pin connected to the EN pin of the board
 	# * _gpio_stby - GPIO pin connected to the ST-BY pin of the board
 	# * _bus - holding instance of SMBus providing I2C bus for communication with chips on the board
 	# * _state - dictionary holding current setup of the board
+	# * _chips - list of instances of control classes of chips fitted on the board
+	# * _lock - lock serializing access to the board between the caller and the idle timer
+	# * _idle - dictionary holding idle timeouts, current idle stage and resume costs
+	# * _idle_timer - holding instance of Timer stepping the board down into the next idle stage
 	
 	
+	CHIPS = {
+		"DSP": "TDA7313",
+		"TUNER": "BIG"
+	}
+	
+	IDLE_ACTIVE = 0
+	IDLE_MUTE = 1
+	IDLE_STANDBY = 2
+	IDLE_OFF = 3
+	
 	#*
 	#* Inits class
 	#* @param int gpio_en - GPIO pin connected to the EN pin of board
 	#* @param int gpio_stby - GPIO pin connected to the ST-BY pin of board
 	#* @param int i2cbus - number of i2c bus the board is connected to
 	#* @param bool gpio_mode_bcm - if the mode of GPIO module used for specifying GPIO pins is BCM (True) or BOARD (False)
+	#* @param dict chips - chips fitted on the board {slot: type} (e.g. {"DSP": "TDA7313"}) or None for the default CHIPS
 	#*
-	def __init__(self, gpio_en, gpio_stby, i2cbus = None, gpio_mode_bcm = False):
+	def __init__(self, gpio_en, gpio_stby, i2cbus = None, gpio_mode_bcm = False, chips = None):
 		if i2cbus == None:
 			raise Exception()#TODO auto selection based on RPI board revision
 		
@@ -78,9 +100,35 @@ class Board:
 			"power": False,
 			"mute": True
 		}
+		self._chips = []
+		
+		self._lock = threading.RLock()
+		self._idle = {
+			"timeout": {self.IDLE_MUTE: 0, self.IDLE_STANDBY: 0, self.IDLE_OFF: 0},
+			"stage": self.IDLE_ACTIVE,
+			"activity": time(),
+			"cost": {self.IDLE_MUTE: None, self.IDLE_STANDBY: None, self.IDLE_OFF: None}
+		}
+		self._idle_timer = None
+		
+		if chips == None:
+			chips = self.CHIPS
 		
-		self.DSP = DSP(self)
-		self.TUNER = TUNER(self)
+		# import drivers first, so a missing one does not leave any chip initialized
+		for slot in chips:
+			if slot.startswith("_") or hasattr(self, slot):
+				raise Exception("Chip slot " + slot + " collides with Board attribute!")
+		
+		drivers = [(slot, loadChip(slot, chips[slot])) for slot in sorted(chips)]
+		
+		addresses = [address for slot, driver in drivers for address in driver.ADDRESSES]
+		if len(addresses) != len(set(addresses)):
+			raise Exception("Chips fitted on the board have conflicting I2C addresses!")
+		
+		for slot, driver in drivers:
+			chip = driver(self)
+			self._chips.append(chip)
+			setattr(self, slot, chip)
 		
 		# init GPIOs
 		self.power(False)
@@ -99,28 +147,38 @@ class Board:
 	#*
 	#* Turns on-board voltage regulators on or off
 	#* @param bool on - True/False for setting the power state, None to return current state only
-	#* @return bool - if the voltage regulators are on or off (software only)
+	#* @return bool - if the voltage regulators are on or off (software only, False also when turned off by the idle manager)
 	#*
 	def power(self, on = None):
-		if on != None:
-			old_state = self._state["power"]
-			
-			self._state["power"] = bool(on)
+		with self._lock:
+			if on != None:
+				old_state = self._state["power"]
+				
+				if old_state and on:
+					self._idleActivity(self.IDLE_STANDBY)
+				
+				self._state["power"] = bool(on)
+				
+				if not self._state["power"]:
+					idle_off = self._idle["stage"] == self.IDLE_OFF
+					self._idleCancel()
+					
+					self.mute(True)
+					if not idle_off:# chips were already prepared by the idle manager
+						for chip in self._chips:
+							chip.beforePowerOff()
+						sleep(0.2)
+				
+				GPIO.output(self._gpio_en, self._state["power"])
+				
+				if not old_state and self._state["power"]:
+					sleep(0.5)
+					for chip in self._chips:
+						chip.afterPowerOn()
+					
+					self._idleActivity(self.IDLE_ACTIVE)
 			
-			if not self._state["power"]:
-				self.mute(True)
-				self.DSP.beforePowerOff()
-				self.TUNER.beforePowerOff()
-				sleep(0.2)
-			
-			GPIO.output(self._gpio_en, self._state["power"])
-			
-			if not old_state and self._state["power"]:
-				sleep(0.5)
-				self.DSP.afterPowerOn()
-				self.TUNER.afterPowerOn()
-		
-		return self._state["power"]
+			return self._state["power"] and self._idle["stage"] != self.IDLE_OFF
 	# end of method power
 	
 	#*
@@ -138,16 +196,57 @@ class Board:
 	#* @return bool - if the amplifier is muted or not (software only)
 	#*
 	def mute(self, on = None):
-		if on != None:
-			on = bool(on)
+		with self._lock:
+			if on != None:
+				on = bool(on)
+				
+				if on:# muting does not wake the board from idle stages
+					self._state["mute"] = True
+					if self._idle["stage"] < self.IDLE_STANDBY:
+						GPIO.output(self._gpio_stby, False)
+				elif self._state["power"]:
+					self._state["mute"] = False
+					if self._idle["stage"] < self.IDLE_STANDBY:# otherwise the amplifier is enabled on resume
+						GPIO.output(self._gpio_stby, True)
+					self._idleActivity(self.IDLE_ACTIVE)
 			
-			if self._state["power"] or on:
-				self._state["mute"] = on
-				GPIO.output(self._gpio_stby, not self._state["mute"])
-		
-		return self._state["mute"]
+			return self._state["mute"]
 	# end of method mute
 	
+	#*
+	#* Sets timeouts of automatic idle stages - after given seconds of inactivity, the board steps down into the stage
+	#* Timeouts are counted from the last activity and 0 disables the stage.
+	#* Changing setup of chips keeps the idle stage (the setup is sent on resume) and unmuting or powering on resumes the board.
+	#* @param int/float mute - seconds before the chips are muted or None to left untouched
+	#* @param int/float standby - seconds before the amplifier is put into stand-by mode or None to left untouched
+	#* @param int/float off - seconds before the voltage regulators are turned off or None to left untouched
+	#* @return {"mute": float, "standby": float, "off": float, "stage": int, "cost": {"mute": float, "standby": float, "off": float}} - current timeouts, idle stage and seconds the last step up from each stage took (None if not resumed yet)
+	#*
+	def idle(self, mute = None, standby = None, off = None):
+		with self._lock:
+			if mute != None or standby != None or off != None:
+				for stage, timeout in ((self.IDLE_MUTE, mute), (self.IDLE_STANDBY, standby), (self.IDLE_OFF, off)):
+					if timeout != None:
+						self._idle["timeout"][stage] = max(0.0, float(timeout))
+				
+				# restart the timer with new timeouts
+				if self._idle_timer != None:
+					self._idle_timer.cancel()
+				self._idleSchedule()
+			
+			return {
+				"mute": self._idle["timeout"][self.IDLE_MUTE],
+				"standby": self._idle["timeout"][self.IDLE_STANDBY],
+				"off": self._idle["timeout"][self.IDLE_OFF],
+				"stage": self._idle["stage"],
+				"cost": {
+					"mute": self._idle["cost"][self.IDLE_MUTE],
+					"standby": self._idle["cost"][self.IDLE_STANDBY],
+					"off": self._idle["cost"][self.IDLE_OFF]
+				}
+			}
+	# end of method idle
+	
 	
 	#*
 	#* Send data over I2C if the Board is powered on
@@ -158,12 +257,150 @@ class Board:
 		if address < 0 or len(data) < 1:
 			return
 		
-		if not self._state["power"]:# send data to board but only if it is powered
+		with self._lock:
+			if not self._state["power"]:# send data to board but only if it is powered
+				return
+			
+			if self._idle["stage"] == self.IDLE_OFF:# state is kept and sent on resume
+				return
+			
+			if len(data) > 1:
+				self._bus.write_i2c_block_data(address, data[0], data[1:])
+			else:
+				self._bus.write_byte(address, data[0])
+	# end of method _i2c_write
+	
+	
+	#*
+	#* Notes activity of a chip before its setup is changed - the board keeps its idle stage
+	#* (with voltage regulators turned off, the new setup is kept in the state of the chip and sent on resume)
+	#*
+	def _chipActivity(self):
+		with self._lock:
+			if self._state["power"]:
+				self._idleActivity(self.IDLE_OFF)
+	# end of method _chipActivity
+	
+	#*
+	#* Notes activity on the board - resumes it from deeper idle stages and starts the idle timer
+	#* @param int stage - the deepest idle stage the activity can be done in
+	#*
+	def _idleActivity(self, stage):
+		self._idle["activity"] = time()
+		
+		if self._idle["stage"] > stage:
+			self._idleResume(stage)
+		
+		if self._idle_timer == None:
+			self._idleSchedule()
+	# end of method _idleActivity
+	
+	#*
+	#* Stops the idle timer and forgets the idle stage without touching the board
+	#*
+	def _idleCancel(self):
+		if self._idle_timer != None:
+			self._idle_timer.cancel()
+			self._idle_timer = None
+		
+		if self._idle["stage"] >= self.IDLE_MUTE:
+			for chip in self._chips:
+				chip.afterMute(False)
+		
+		self._idle["stage"] = self.IDLE_ACTIVE
+	# end of method _idleCancel
+	
+	#*
+	#* Starts the idle timer for the earliest timeout of enabled deeper idle stages, if there is any
+	#*
+	def _idleSchedule(self):
+		self._idle_timer = None
+		
+		if not self._state["power"]:
+			return
+		
+		timeouts = [self._idle["timeout"][stage] for stage in range(self._idle["stage"] + 1, self.IDLE_OFF + 1) if self._idle["timeout"][stage] > 0]
+		if len(timeouts) < 1:
 			return
 		
-		if len(data) > 1:
-			self._bus.write_i2c_block_data(address, data[0], data[1:])
-		else:
-			self._bus.write_byte(address, data[0])
-	# end of method _i2c_write
+		delay = self._idle["activity"] + min(timeouts) - time()
+		
+		# the timer holds weak reference only, so it does not keep the Board alive
+		self._idle_timer = threading.Timer(max(0.0, delay), Board._idleTimeout, [weakref.ref(self)])
+		self._idle_timer.daemon = True
+		self._idle_timer.start()
+	# end of method _idleSchedule
+	
+	#*
+	#* Called by the idle timer - steps the board down into the deepest idle stage its timeout elapsed (through all stages between)
+	#* @param weakref board - weak reference to Board the timer was started for
+	#*
+	@staticmethod
+	def _idleTimeout(board):
+		board = board()
+		if board == None:
+			return
+		
+		with board._lock:
+			if threading.current_thread() is not board._idle_timer:# cancelled meanwhile
+				return
+			
+			inactive = time() - board._idle["activity"]
+			
+			stage = board._idle["stage"]
+			for next_stage in range(stage + 1, board.IDLE_OFF + 1):
+				if 0 < board._idle["timeout"][next_stage] <= inactive:
+					stage = next_stage
+			
+			board._idleEnter(stage)
+			board._idleSchedule()
+	# end of method _idleTimeout
+	
+	#*
+	#* Steps the board down into given idle stage through all stages between
+	#* @param int stage - idle stage to enter
+	#*
+	def _idleEnter(self, stage):
+		while self._idle["stage"] < stage:
+			next_stage = self._idle["stage"] + 1
+			
+			if next_stage == self.IDLE_MUTE:
+				for chip in self._chips:
+					chip.beforeMute()
+			elif next_stage == self.IDLE_STANDBY:
+				GPIO.output(self._gpio_stby, False)
+			elif next_stage == self.IDLE_OFF:
+				for chip in self._chips:
+					chip.beforePowerOff()
+				sleep(0.2)
+				GPIO.output(self._gpio_en, False)
+			
+			self._idle["stage"] = next_stage
+	# end of method _idleEnter
+	
+	#*
+	#* Steps the board back up from current idle stage into given one, replaying setup of chips from their state
+	#* @param int stage - idle stage to resume into
+	#*
+	def _idleResume(self, stage):
+		while self._idle["stage"] > stage:
+			current_stage = self._idle["stage"]
+			start = time()
+			
+			if current_stage == self.IDLE_OFF:
+				self._idle["stage"] = self.IDLE_STANDBY# let the replay through
+				GPIO.output(self._gpio_en, True)
+				sleep(0.5)
+				for chip in self._chips:
+					chip.afterPowerOn()
+			elif current_stage == self.IDLE_STANDBY:
+				self._idle["stage"] = self.IDLE_MUTE
+				GPIO.output(self._gpio_stby, not self._state["mute"])
+			elif current_stage == self.IDLE_MUTE:
+				self._idle["stage"] = self.IDLE_ACTIVE
+				for chip in self._chips:
+					chip.afterMute()
+			
+			self._idle["cost"][current_stage] = time() - start
+	# end of method _idleResume
 # end of class Board
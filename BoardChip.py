@@ -25,12 +25,162 @@
 #
 
 
+import importlib
+import pkgutil
+import weakref
+
+
+class NoBoardException(Exception):
+	pass
+# end of class NoBoardException
+
+class NoChipException(Exception):
+	pass
+# end of class NoChipException
+
+
 class BoardChip:
+	# Methods list
+	# * __init__(board)
+	# * afterPowerOn()
+	# * beforePowerOff()
+	# * afterMute(send = True)
+	# * beforeMute()
+	
+	# Constants list
+	# * SLOT - name of the Board attribute the chip is accessible through (e.g. DSP, TUNER)
+	# * ADDRESSES - tuple of I2C addresses the chip is listening on
+	# * INFO - type of the supported chip
+	# * INFO_TEXT - more verbose description of the supported chip
+	
+	# Internal variables list
+	# * _board - holding weak reference to Board the chip is on
+	
+	
+	SLOT = None
+	ADDRESSES = ()
+	INFO = None
+	INFO_TEXT = None
+	
+	#*
+	#* Inits class
+	#* @param object board - instance of Board the chip is on
+	#*
+	def __init__(self, board):
+		if board == None:
+			raise NoBoardException("Cannot init " + str(self.SLOT) + " on no board!")
+		
+		self._board = weakref.ref(board)
+	# end of method __init__
+	
+	#*
+	#* Called by Board after its voltage regulators were turned on - chip should send its whole setup here
+	#*
 	def afterPowerOn(self):
 		pass
 	# end of method afterPowerOn
 	
+	#*
+	#* Called by Board before its voltage regulators are turned off
+	#*
 	def beforePowerOff(self):
 		pass
 	# end of method beforePowerOff
+	
+	#*
+	#* Called by Board when leaving idle mute - chip should unmute its output and send what beforeMute changed
+	#* @param bool send - if the change should be sent or kept in the state only (when the Board is being turned off)
+	#*
+	def afterMute(self, send = True):
+		pass
+	# end of method afterMute
+	
+	#*
+	#* Called by Board when entering idle mute - chip should mute its output keeping the mute in its state
+	#*
+	def beforeMute(self):
+		pass
+	# end of method beforeMute
+	
+	
+	#*
+	#* Notes activity on the Board - to be called before changing setup of the chip
+	#*
+	def _activity(self):
+		self._board()._chipActivity()
+	# end of method _activity
 # end of class BoardChip
+
+
+# Registered chip drivers - (slot, name) => (module, class)
+_drivers = {}
+# Already imported chip driver classes - (slot, name) => class
+_loaded = {}
+
+#*
+#* Registers chip driver, which does not follow the SLOT_NAME module/class naming
+#* @param string slot - name of the Board attribute the chip will be accessible through (e.g. DSP, TUNER)
+#* @param string name - type of the chip (e.g. TDA7313)
+#* @param string module - name of the module holding the driver or None to use SLOT_NAME
+#* @param string cls - name of the driver class inside the module or None to use SLOT_NAME
+#*
+def registerChip(slot, name, module = None, cls = None):
+	if module == None:
+		module = slot + "_" + name
+	if cls == None:
+		cls = slot + "_" + name
+	
+	_drivers[(slot, name)] = (module, cls)
+	_loaded.pop((slot, name), None)
+# end of function registerChip
+
+#*
+#* Returns chip driver class, importing its module on first use
+#* @param string slot - name of the Board attribute the chip is accessible through (e.g. DSP, TUNER)
+#* @param string name - type of the chip (e.g. TDA7313)
+#* @return class - driver class derived from BoardChip
+#*
+def loadChip(slot, name):
+	key = (slot, name)
+	
+	if key not in _loaded:
+		module, cls = _drivers.get(key, (slot + "_" + name, slot + "_" + name))
+		
+		# errors raised while importing an existing driver module are left to propagate
+		if not _moduleExists(module):
+			raise NoChipException("No driver for " + slot + " " + name + " found!")
+		
+		driver = getattr(importlib.import_module(module), cls, None)
+		if driver == None:
+			raise NoChipException("No driver for " + slot + " " + name + " found in module " + module + "!")
+		
+		if not isinstance(driver, type) or not issubclass(driver, BoardChip):
+			raise NoChipException("Driver for " + slot + " " + name + " is not a BoardChip!")
+		
+		if driver.SLOT != slot:
+			raise NoChipException("Driver for " + slot + " " + name + " is a " + str(driver.SLOT) + " driver!")
+		
+		_loaded[key] = driver
+	
+	return _loaded[key]
+# end of function loadChip
+
+#*
+#* Checks if module can be imported without importing it
+#* @param string module - name of the module
+#* @return bool - if the module exists
+#*
+def _moduleExists(module):
+	try:
+		from importlib.util import find_spec
+	except ImportError:# Python 2
+		try:
+			return pkgutil.find_loader(module) != None
+		except ImportError:
+			return False
+	
+	try:
+		return find_spec(module) != None
+	except ImportError:# missing parent package
+		return False
+# end of function _moduleExists
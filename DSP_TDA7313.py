@@ -27,7 +27,6 @@
 
 from BoardChip import BoardChip
 
-import weakref
 import math
 
 
@@ -41,6 +40,8 @@ class DSP_TDA7313(BoardChip):
 	# * treble(level = None, dB = False)
 	
 	# Constants list
+	# * SLOT - name of the Board attribute the DSP is accessible through
+	# * ADDRESSES - I2C addresses of the DSP
 	# * INFO - type of the supported DSP
 	# * INFO_TEXT - more verbose description of the supported DSP
 	
@@ -49,6 +50,8 @@ class DSP_TDA7313(BoardChip):
 	# * _state - dictionary holding current setup of the DSP
 	
 	
+	SLOT = "DSP"
+	ADDRESSES = (0x44,)
 	INFO = "TDA7313"
 	INFO_TEXT = "TDA7313 simple DSP"
 	
@@ -57,10 +60,7 @@ class DSP_TDA7313(BoardChip):
 	#* @param object board - instance of Board the DSP is on
 	#*
 	def __init__(self, board):
-		if board == None:
-			raise NoBoardException("Cannot init DSP on no board!")
-		
-		self._board = weakref.ref(board)
+		BoardChip.__init__(self, board)
 		
 		self._state = {
 			"volume": 0,
@@ -70,7 +70,8 @@ class DSP_TDA7313(BoardChip):
 			"input_loudness": True,
 			"input_gain": 0,
 			"bass": 0,
-			"treble": 0
+			"treble": 0,
+			"mute": False
 		}
 		
 		# init
@@ -81,6 +82,17 @@ class DSP_TDA7313(BoardChip):
 		self._i2c()#TODO
 	# end of method afterPowerOn
 	
+	def afterMute(self, send = True):
+		self._state["mute"] = False
+		if send:
+			self._i2c()#TODO
+	# end of method afterMute
+	
+	def beforeMute(self):
+		self._state["mute"] = True
+		self._i2c()#TODO
+	# end of method beforeMute
+	
 	
 	#*
 	#* Sets main volume
@@ -90,6 +102,8 @@ class DSP_TDA7313(BoardChip):
 	#*
 	def volume(self, vol = None, dB = False):
 		if vol != None:
+			self._activity()
+			
 			if dB:
 				if vol < -78.75:
 					vol = -78.75
@@ -119,6 +133,8 @@ class DSP_TDA7313(BoardChip):
 	#*
 	def balance(self, left = None, right = None, dB = False):
 		if left != None or right != None:
+			self._activity()
+			
 			if left != None:
 				if dB:
 					if left < -38.75:
@@ -169,6 +185,8 @@ class DSP_TDA7313(BoardChip):
 	#*
 	def input(self, input = None, loudness = None, gain = None, dB = False):
 		if input != None or loudness != None or gain != None:
+			self._activity()
+			
 			if input != None:
 				if input < 0:
 					input = 0
@@ -208,6 +226,8 @@ class DSP_TDA7313(BoardChip):
 	#*
 	def bass(self, level = None, dB = False):
 		if level != None:
+			self._activity()
+			
 			if dB:
 				level = level / 2
 			
@@ -231,6 +251,8 @@ class DSP_TDA7313(BoardChip):
 	#*
 	def treble(self, level = None, dB = False):
 		if level != None:
+			self._activity()
+			
 			if dB:
 				level = level / 2
 			
@@ -256,10 +278,16 @@ class DSP_TDA7313(BoardChip):
 		
 		# build bytes from instance variables
 		byte_volume = 63 - self._state["volume"]
-		byte_balance_left_1 = (0b100 << 5) | (31 - self._state["balance_left"])
-		byte_balance_left_2 = (0b110 << 5) | (31 - self._state["balance_left"])
-		byte_balance_right_1 = (0b101 << 5) | (31 - self._state["balance_right"])
-		byte_balance_right_2 = (0b111 << 5) | (31 - self._state["balance_right"])
+		if self._state["mute"]:# all speaker attenuators at 0b11111 mean mute
+			byte_balance_left_1 = (0b100 << 5) | 31
+			byte_balance_left_2 = (0b110 << 5) | 31
+			byte_balance_right_1 = (0b101 << 5) | 31
+			byte_balance_right_2 = (0b111 << 5) | 31
+		else:
+			byte_balance_left_1 = (0b100 << 5) | (31 - self._state["balance_left"])
+			byte_balance_left_2 = (0b110 << 5) | (31 - self._state["balance_left"])
+			byte_balance_right_1 = (0b101 << 5) | (31 - self._state["balance_right"])
+			byte_balance_right_2 = (0b111 << 5) | (31 - self._state["balance_right"])
 		
 		byte_input = (0b010 << 5)
 		byte_input |= ((3 - self._state["input_gain"]) << 3)
@@ -279,6 +307,6 @@ class DSP_TDA7313(BoardChip):
 			byte_treble |= (1 << 3) | (7 - self._state["treble"])
 		
 		# send data
-		self._board()._i2c_write(0x44, [byte_volume, byte_balance_left_1, byte_balance_left_2, byte_balance_right_1, byte_balance_right_2, byte_input, byte_bass, byte_treble])
+		self._board()._i2c_write(self.ADDRESSES[0], [byte_volume, byte_balance_left_1, byte_balance_left_2, byte_balance_right_1, byte_balance_right_2, byte_input, byte_bass, byte_treble])
 	# end of method _i2c
 # end of class DSP_TDA7313
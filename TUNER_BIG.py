@@ -27,8 +27,6 @@
 
 from BoardChip import BoardChip
 
-import weakref
-
 
 class TUNER_BIG(BoardChip):
 	# Methods list
@@ -36,6 +34,10 @@ class TUNER_BIG(BoardChip):
 	# * tune(freq = None)
 	
 	# Constants list
+	# * SLOT - name of the Board attribute the TUNER is accessible through
+	# * ADDRESS_BACKEND - I2C address of the backend-chip
+	# * ADDRESS_FRONTEND - I2C address of the frontend-chip
+	# * ADDRESSES - I2C addresses of all chips of the TUNER
 	# * INFO - type of the supported TUNER
 	# * INFO_TEXT - more verbose description of the supported TUNER
 	
@@ -44,6 +46,10 @@ class TUNER_BIG(BoardChip):
 	# * _state - dictionary holding current setup of the board
 	
 	
+	SLOT = "TUNER"
+	ADDRESS_BACKEND = 0x61
+	ADDRESS_FRONTEND = 0x62
+	ADDRESSES = (ADDRESS_BACKEND, ADDRESS_FRONTEND)
 	INFO = "BIG"
 	INFO_TEXT = "Bigger tuner with TEA6825 backend and TEA6810 frontend chips"
 	
@@ -52,10 +58,7 @@ class TUNER_BIG(BoardChip):
 	#* @param object board - instance of Board the TUNER is on
 	#*
 	def __init__(self, board):
-		if board == None:
-			raise NoBoardException("Cannot init TUNER on no board!")
-		
-		self._board = weakref.ref(board)
+		BoardChip.__init__(self, board)
 		
 		self._state = {
 			"stereo": True,
@@ -93,6 +96,9 @@ class TUNER_BIG(BoardChip):
 		change_freq = False
 		change_step = False
 		
+		if freq != None or step != None:
+			self._activity()
+		
 		if freq != None:
 			if freq < 30.4:
 				freq = 30.4
@@ -148,9 +154,9 @@ class TUNER_BIG(BoardChip):
 		
 		# send data
 		if last_byte > 1:
-			self._board()._i2c_write(0x61, [byte_1, byte_2])
+			self._board()._i2c_write(self.ADDRESS_BACKEND, [byte_1, byte_2])
 		else:
-			self._board()._i2c_write(0x61, [byte_1])
+			self._board()._i2c_write(self.ADDRESS_BACKEND, [byte_1])
 	# end of method _i2c_backend
 	
 	#*
@@ -180,11 +186,11 @@ class TUNER_BIG(BoardChip):
 		self._i2c_backend(1)
 		# send data
 		if last_byte > 3:
-			self._board()._i2c_write(0x62, [byte_1, byte_2, byte_3, 0x00])
+			self._board()._i2c_write(self.ADDRESS_FRONTEND, [byte_1, byte_2, byte_3, 0x00])
 		elif last_byte > 2:
-			self._board()._i2c_write(0x62, [byte_1, byte_2, byte_3])
+			self._board()._i2c_write(self.ADDRESS_FRONTEND, [byte_1, byte_2, byte_3])
 		else:
-			self._board()._i2c_write(0x62, [byte_1, byte_2])
+			self._board()._i2c_write(self.ADDRESS_FRONTEND, [byte_1, byte_2])
 		# disable I2C
 		self._state["frontend_i2c"] = False
 		self._i2c_backend(1)